@@ -1,42 +1,177 @@
 # algorithms.py
+import sys
 import threading
 import time
-from collections import defaultdict, deque
-from heapq import heappush, heappop
-import copy
+from collections import deque
 from scapy.all import *
 
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path
+except ImportError:
+    csr_matrix = None
+    shortest_path = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
+def build_adjacency(link_delays):
+    """Build an id-indexed [(neighbor_id, delay)] adjacency list from (node1, node2, delay) links"""
+    name_to_id = {}
+    id_to_name = []
+    adj = []
+
+    def node_id(name):
+        if name not in name_to_id:
+            name_to_id[name] = len(id_to_name)
+            id_to_name.append(name)
+            adj.append([])
+        return name_to_id[name]
+
+    for node1, node2, delay in link_delays:
+        node1, node2 = node_id(node1), node_id(node2)
+        adj[node1].append((node2, delay))
+        adj[node2].append((node1, delay))
+
+    return adj, name_to_id, id_to_name
+
+def _dijkstra_core(xadj, adj_dst, adj_w, src, n):
+    """Dense O(V^2) Dijkstra over CSR arrays, compiled with Numba"""
+    dist = np.full(n, np.inf)
+    prev = np.full(n, -1, np.int64)
+    done = np.zeros(n, np.bool_)
+    dist[src] = 0.0
+
+    for _ in range(n):
+        u = -1
+        best = np.inf
+        for v in range(n):
+            if not done[v] and dist[v] < best:
+                best = dist[v]
+                u = v
+        if u == -1:
+            break
+
+        done[u] = True
+        for k in range(xadj[u], xadj[u + 1]):
+            v = adj_dst[k]
+            d = best + adj_w[k]
+            if not done[v] and d < dist[v]:
+                dist[v] = d
+                prev[v] = u
+
+    return dist, prev
+
+if njit is not None:
+    _dijkstra_core = njit(cache=True)(_dijkstra_core)
+
+class IndexedHeap:
+    """Binary min-heap of node ids that supports decrease_key"""
+    def __init__(self, size):
+        self.heap = []
+        self.pos = [-1] * size
+        self.keys = [float('inf')] * size
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, node, key):
+        """Insert a node that is not in the heap"""
+        self.keys[node] = key
+        self.pos[node] = len(self.heap)
+        self.heap.append(node)
+        self._sift_up(self.pos[node])
+
+    def decrease_key(self, node, key):
+        """Lower the key of a node, inserting it if it is not in the heap"""
+        if self.pos[node] == -1:
+            self.push(node, key)
+        else:
+            self.keys[node] = key
+            self._sift_up(self.pos[node])
+
+    def pop_min(self):
+        """Remove and return the (node, key) pair with the smallest key"""
+        heap = self.heap
+        node = heap[0]
+        last = heap.pop()
+        self.pos[node] = -1
+
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+
+        return node, self.keys[node]
+
+    def _sift_up(self, i):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        node = heap[i]
+        key = keys[node]
+
+        while i > 0:
+            parent = (i - 1) >> 1
+            if keys[heap[parent]] <= key:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i]] = i
+            i = parent
+
+        heap[i] = node
+        pos[node] = i
+
+    def _sift_down(self, i):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        size = len(heap)
+        node = heap[i]
+        key = keys[node]
+
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if key <= keys[heap[child]]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+
+        heap[i] = node
+        pos[node] = i
+
 class DistanceVector:
-    def __init__(self, host, net, link_delays):
+    _scheduler_thread = None
+    _stop_event = None
+
+    def __init__(self, host, net, adj, name_to_id, id_to_name):
         self.host = host
         self.net = net
-        self.link_delays = link_delays
-        self.distance_vector = defaultdict(lambda: float('inf'))
-        self.next_hop = {}
+        self.adj = adj
+        self.name_to_id = name_to_id
+        self.id_to_name = id_to_name
+        self.id = name_to_id[host.name]
+        self.distance_vector = [float('inf')] * len(adj)
+        self.next_hop = [-1] * len(adj)
         self.neighbors = {}
+        self.neighbor_instances = []
         self.running = False
-        self.lock = threading.Lock()
+        self.version = 0
 
-        self.distance_vector[self.host.name] = 0
+        self.distance_vector[self.id] = 0
 
         self._build_topology()
-
-    def _get_connected_nodes(self, node_name):
-        """Get all nodes connected to the given node"""
-        connected = []
-
-        for link in self.link_delays:
-            node1, node2 = link.intf1.node.name, link.intf2.node.name
-            if node_name == node1:
-                connected.append((node2, float(self.link_delays[link].replace('ms', ''))))
-            elif node_name == node2:
-                connected.append((node1, float(self.link_delays[link].replace('ms', ''))))
-        return connected
+        # Destinations whose distance changed since the last update was sent
+        self.changed = {dest for dest, cost in enumerate(self.distance_vector) if cost != float('inf')}
 
     def _build_topology(self):
         """Build understanding of network topology and initial distances using BFS"""
         visited = set()
-        queue = deque([(self.host.name, 0)]) 
+        queue = deque([(self.id, 0)]) 
 
         while queue:
             current_node, current_delay = queue.popleft()
@@ -44,109 +179,128 @@ class DistanceVector:
                 continue
 
             visited.add(current_node)
-            connected = self._get_connected_nodes(current_node)
-
-            for next_node, link_delay in connected:
+            for next_node, link_delay in self.adj[current_node]:
                 total_delay = current_delay + link_delay
+                next_name = self.id_to_name[next_node]
 
-                if next_node.startswith('h'):
+                if next_name.startswith('h'):
                     if next_node not in self.neighbors or total_delay < self.neighbors[next_node]:
                         self.neighbors[next_node] = total_delay
                         self.distance_vector[next_node] = total_delay
                         self.next_hop[next_node] = next_node
 
-                if next_node.startswith('s') and next_node not in visited:
+                if next_name.startswith('s') and next_node not in visited:
                     queue.append((next_node, total_delay))
 
     def _create_update_packet(self):
-        """Create a distance vector update packet"""
-        return {
-            'source': self.host.name,
-            'distances': dict(self.distance_vector)
+        """Create a distance vector update packet with the entries changed since the last one"""
+        update_packet = {
+            'source': self.id,
+            'distances': {dest: self.distance_vector[dest] for dest in self.changed}
         }
+        self.changed.clear()
+        return update_packet
 
     def _process_update(self, update_packet):
         """Process received distance vector update"""
         source = update_packet['source']
         received_distances = update_packet['distances']
 
-        with self.lock:
-            updated = False
-            direct_cost_to_source = self.neighbors.get(source, float('inf'))
+        updated = False
+        direct_cost_to_source = self.neighbors.get(source, float('inf'))
+
+        # Only hosts ever get a finite distance, so switches never win the comparison below
+        for dest, cost in received_distances.items():
+            if dest != self.id:
+                new_cost = direct_cost_to_source + cost
+                current_cost = self.distance_vector[dest]
 
-            for dest, cost in received_distances.items():
-                if dest != self.host.name and dest.startswith('h'):
-                    new_cost = direct_cost_to_source + float(cost)
-                    current_cost = self.distance_vector[dest]
+                if new_cost < current_cost:
+                    self.distance_vector[dest] = new_cost
+                    self.next_hop[dest] = source
+                    self.changed.add(dest)
+                    updated = True
 
-                    if new_cost < current_cost:
-                        self.distance_vector[dest] = new_cost
-                        self.next_hop[dest] = source
-                        updated = True
+        if updated:
+            self.version += 1
 
-            return updated
+        return updated
 
     def _send_updates(self):
         """Send distance vector updates to neighbors"""
+        if not self.changed:
+            return
+
         update_packet = self._create_update_packet()
 
-        for neighbor_name in self.neighbors:
-            neighbor_host = self.net.getNodeByName(neighbor_name)
-            if hasattr(neighbor_host, 'dv_instance'):
-                neighbor_dv = neighbor_host.dv_instance
-                neighbor_dv._process_update(update_packet)
+        for neighbor_dv in self.neighbor_instances:
+            neighbor_dv._process_update(update_packet)
 
     def start(self):
         """Start the distance vector algorithm"""
         self.running = True
         self.host.dv_instance = self
-        thread = threading.Thread(target=self._run)
-        thread.daemon = True
-        thread.start()
 
     def stop(self):
         """Stop the distance vector algorithm"""
         self.running = False
 
-    def _run(self):
-        """Main loop for the distance vector algorithm"""
+    @staticmethod
+    def _run_scheduler(dv_instances, stop_event):
+        """Main loop sending the updates of every running instance"""
         update_interval = 1
 
-        while self.running:
-            self._send_updates()
-            time.sleep(update_interval)
+        while not stop_event.is_set() and any(dv.running for dv in dv_instances.values()):
+            for dv in list(dv_instances.values()):
+                if dv.running:
+                    dv._send_updates()
+            stop_event.wait(update_interval)
 
     def get_route(self, destination):
         """Get the route and total delay to a destination"""
-        if destination not in self.distance_vector:
+        dest = self.name_to_id.get(destination)
+        if dest is None:
             return None, float('inf')
 
-        return [self.host.name, destination], self.distance_vector[destination]
+        return [self.host.name, destination], self.distance_vector[dest]
 
     def print_routing_table(self):
         """Print the current routing table"""
-        print("\nRouting table for {}:".format(self.host.name))
-        print("Destination\tTotal Delay")
-        for dest in sorted(self.distance_vector.keys()):
-            if dest != self.host.name and dest.startswith('h'):
-                path, delay = self.get_route(dest)
-                print("{}\t\t{:.1f}ms".format(dest, delay))
+        rows = ["\nRouting table for {}:".format(self.host.name), "Destination\tTotal Delay"]
+        rows.extend("{}\t\t{:.1f}ms".format(dest, self.distance_vector[self.name_to_id[dest]])
+                    for dest in sorted(self.id_to_name)
+                    if dest != self.host.name and dest.startswith('h'))
+        sys.stdout.write('\n'.join(rows) + '\n')
 
     @staticmethod
     def setup_distance_vector(dv_instances, net, link_delays):
         """Setup distance vector routing and store instances"""
+        adj, name_to_id, id_to_name = build_adjacency(link_delays)
+
         for host in net.hosts:
-            dv = DistanceVector(host, net, link_delays)
+            dv = DistanceVector(host, net, adj, name_to_id, id_to_name)
             dv_instances[host.name] = dv
             dv.start()
             host.dv_instance = dv
 
+        for dv in dv_instances.values():
+            dv.neighbor_instances = [dv_instances[id_to_name[n]] for n in dv.neighbors if id_to_name[n] in dv_instances]
+
+        DistanceVector._stop_event = threading.Event()
+        DistanceVector._scheduler_thread = threading.Thread(target=DistanceVector._run_scheduler, args=(dv_instances, DistanceVector._stop_event))
+        DistanceVector._scheduler_thread.daemon = True
+        DistanceVector._scheduler_thread.start()
+
     @staticmethod
     def cleanup_distance_vector(dv_instances):
         """Stop all distance vector instances"""
         for dv in dv_instances.values():
             dv.stop()
 
+        if DistanceVector._stop_event is not None:
+            DistanceVector._stop_event.set()
+            DistanceVector._scheduler_thread.join()
+
     @staticmethod
     def print_all_routing_tables(dv_instances):
         """Print routing tables from all hosts"""
@@ -159,196 +313,267 @@ class DistanceVector:
             print("-" * 40)
 
 class LinkState:
-    def __init__(self, host, net, link_delays):
+    _scheduler_thread = None
+    _stop_event = None
+
+    def __init__(self, host, net, adj, name_to_id, id_to_name, shortest_paths):
         self.host = host
         self.net = net
-        self.link_delays = link_delays
-        self.topology = defaultdict(dict)
-        self.shortest_paths = {}
+        self.adj = adj
+        self.name_to_id = name_to_id
+        self.id_to_name = id_to_name
+        self.id = name_to_id[host.name]
+        self.topology = [dict(links) for links in adj]
+        self.shortest_paths = shortest_paths
+        # Routes already converted to names, dropped when _route_version moves on
+        self._route_version = 0
+        self._route_cache = (0, {})
+        self.instances_by_id = [None] * len(adj)
         self.running = False
-        self.lock = threading.Lock()
         self.sequence_number = 0
-        
-        self._build_initial_topology()
-        self._dijkstra()
-
-    def _get_connected_nodes(self, node_name):
-        """Get all nodes connected to the given node"""
-        connected = []
-        for link in self.link_delays:
-            node1, node2 = link.intf1.node.name, link.intf2.node.name
-            if node_name == node1:
-                delay = float(self.link_delays[link].replace('ms', ''))
-                connected.append((node2, delay))
-            elif node_name == node2:
-                delay = float(self.link_delays[link].replace('ms', ''))
-                connected.append((node1, delay))
-        return connected
-
-    def _build_initial_topology(self):
-        """Build initial topology understanding using BFS"""
-        visited = set()
-        queue = deque([(self.host.name, 0)])
-        
-        while queue:
-            current_node, current_delay = queue.popleft()
-            if current_node in visited:
-                continue
-                
-            visited.add(current_node)
-            
-            connected = self._get_connected_nodes(current_node)
-            
-            for next_node, link_delay in connected:
-                self.topology[current_node][next_node] = link_delay
-                self.topology[next_node][current_node] = link_delay
-                
-                if next_node.startswith('s') and next_node not in visited:
-                    queue.append((next_node, current_delay + link_delay))
+        # Readers use self.topology/self.shortest_paths without locking; writers
+        # build new copies under this lock and publish them by assignment
+        self._write_lock = threading.Lock()
 
-    def _dijkstra(self):
-        """Compute shortest paths to all destinations"""
-        with self.lock:
-            distances = defaultdict(lambda: float('inf'))
-            distances[self.host.name] = 0
-            previous = {}
-            pq = [(0, self.host.name)]
-            visited = set()
-
-            while pq:
-                current_distance, current_node = heappop(pq)
-                
-                if current_node in visited:
+    @staticmethod
+    def _build_csr(topology):
+        """Flatten the topology into CSR arrays (xadj, adj_dst, adj_w)"""
+        xadj = [0]
+        adj_dst = []
+        adj_w = []
+        for links in topology:
+            adj_dst.extend(links.keys())
+            adj_w.extend(links.values())
+            xadj.append(len(adj_dst))
+
+        if njit is not None:
+            return np.array(xadj, np.int64), np.array(adj_dst, np.int64), np.array(adj_w, np.float64)
+
+        return xadj, adj_dst, adj_w
+
+    @staticmethod
+    def _build_paths(source, distances, previous, id_to_name):
+        """Walk the predecessor list back from every reachable host"""
+        shortest_paths = {}
+        for dest, cost in enumerate(distances):
+            if dest != source and cost != float('inf') and id_to_name[dest].startswith('h'):
+                path = []
+                current = dest
+                while current != source:
+                    path.append(current)
+                    current = previous[current]
+                path.append(source)
+                path.reverse()
+                shortest_paths[dest] = {
+                    'path': path,
+                    'cost': cost
+                }
+
+        return shortest_paths
+
+    @staticmethod
+    def _shortest_paths_from(csr, source, id_to_name):
+        """Run Dijkstra from source and return the paths to every host"""
+        xadj, adj_dst, adj_w = csr
+        n = len(xadj) - 1
+
+        if njit is not None:
+            distances, previous = _dijkstra_core(xadj, adj_dst, adj_w, source, n)
+            return LinkState._build_paths(source, distances.tolist(), previous.tolist(), id_to_name)
+
+        distances = [float('inf')] * n
+        distances[source] = 0.0
+        previous = [-1] * n
+        heap = IndexedHeap(n)
+        heap.push(source, 0.0)
+        visited = [False] * n
+
+        while heap:
+            current_node, current_distance = heap.pop_min()
+            visited[current_node] = True
+            
+            for k in range(xadj[current_node], xadj[current_node + 1]):
+                neighbor = adj_dst[k]
+                if visited[neighbor]:
                     continue
                     
-                visited.add(current_node)
+                distance = current_distance + adj_w[k]
                 
-                for neighbor, weight in self.topology[current_node].items():
-                    if neighbor in visited:
-                        continue
-                        
-                    distance = current_distance + weight
-                    
-                    if distance < distances[neighbor]:
-                        distances[neighbor] = distance
-                        previous[neighbor] = current_node
-                        heappush(pq, (distance, neighbor))
-
-            self.shortest_paths.clear()
-            for dest in distances:
-                if dest != self.host.name and dest.startswith('h'):
-                    path = []
-                    current = dest
-                    while current in previous:
-                        path.append(current)
-                        current = previous[current]
-                    path.append(self.host.name)
-                    path.reverse()
-                    self.shortest_paths[dest] = {
-                        'path': path,
-                        'cost': distances[dest]
-                    }
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_node
+                    heap.decrease_key(neighbor, distance)
+
+        return LinkState._build_paths(source, distances, previous, id_to_name)
+
+    @staticmethod
+    def _compute_all_pairs(adj, hosts, id_to_name):
+        """Compute shortest paths from every host over the shared adjacency"""
+        csr = LinkState._build_csr([dict(links) for links in adj])
+
+        if shortest_path is not None:
+            return LinkState._compute_all_pairs_scipy(csr, hosts, id_to_name)
+
+        return {src: LinkState._shortest_paths_from(csr, src, id_to_name) for src in hosts}
+
+    @staticmethod
+    def _compute_all_pairs_scipy(csr, hosts, id_to_name):
+        """Compute shortest paths from every host with SciPy's compiled Dijkstra"""
+        xadj, adj_dst, adj_w = csr
+        n = len(xadj) - 1
+        graph = csr_matrix((adj_w, adj_dst, xadj), shape=(n, n))
+        distances, predecessors = shortest_path(graph, method='D', indices=hosts, return_predecessors=True)
+
+        return {source: LinkState._build_paths(source, distances[row].tolist(), predecessors[row].tolist(), id_to_name)
+                for row, source in enumerate(hosts)}
+
+    def _dijkstra(self, topology):
+        """Compute shortest paths to all destinations"""
+        return self._shortest_paths_from(self._build_csr(topology), self.id, self.id_to_name)
 
     def _create_lsa(self):
         """Create a Link State Advertisement"""
-        with self.lock:
-            return {
-                'source': self.host.name,
-                'seq_num': self.sequence_number,
-                'links': dict(self.topology[self.host.name])
-            }
+        return {
+            'source': self.id,
+            'seq_num': self.sequence_number,
+            'links': tuple(self.topology[self.id].items())
+        }
 
     def _flood_lsa(self, lsa):
         """Flood LSA to neighbors"""
-        visited = {self.host.name}
-        queue = list(self.topology[self.host.name].keys())
+        topology = self.topology
+        visited = {self.id}
+        queue = deque(topology[self.id].keys())
         
         while queue:
-            next_node = queue.pop(0)
+            next_node = queue.popleft()
             if next_node in visited:
                 continue
                 
             visited.add(next_node)
-            node = self.net.getNodeByName(next_node)
+            ls = self.instances_by_id[next_node]
             
-            if hasattr(node, 'ls_instance'):
-                node.ls_instance._process_lsa(copy.deepcopy(lsa))
-                
-                if next_node in self.topology:
-                    queue.extend([n for n in self.topology[next_node] if n not in visited])
+            if ls is not None:
+                ls._process_lsa(lsa)
+                queue.extend([n for n in topology[next_node] if n not in visited])
 
     def _process_lsa(self, lsa):
         """Process received LSA and update topology"""
-        with self.lock:
-            source = lsa['source']
-            links = lsa['links']
-            
-            changed = False
-            for dest, cost in links.items():
-                if (dest not in self.topology[source] or 
-                    self.topology[source][dest] != cost):
-                    self.topology[source][dest] = cost
-                    self.topology[dest][source] = cost
-                    changed = True
-            
-            if changed:
-                self._dijkstra()
+        source = lsa['source']
+        links = lsa['links']
+
+        with self._write_lock:
+            topology = self.topology
+            changes = [(dest, cost) for dest, cost in links if topology[source].get(dest) != cost]
+            if not changes:
+                return
+
+            # Only the rows touched by this LSA are copied, the rest are shared
+            new_topology = list(topology)
+            new_topology[source] = dict(topology[source])
+            copied = {source}
+            for dest, cost in changes:
+                if dest not in copied:
+                    new_topology[dest] = dict(topology[dest])
+                    copied.add(dest)
+                new_topology[source][dest] = cost
+                new_topology[dest][source] = cost
+
+            shortest_paths = self._dijkstra(new_topology)
+            self.topology = new_topology
+            self.shortest_paths = shortest_paths
+            self._route_version += 1
 
     def start(self):
         """Start the link state algorithm"""
         self.running = True
         self.host.ls_instance = self
-        threading.Thread(target=self._run).start()
 
     def stop(self):
         """Stop the link state algorithm"""
         self.running = False
 
-    def _run(self):
-        """Main loop for the link state algorithm"""
+    def _send_lsa(self):
+        """Create and flood a new LSA"""
+        lsa = self._create_lsa()
+        self.sequence_number += 1
+        self._flood_lsa(lsa)
+
+    @staticmethod
+    def _run_scheduler(ls_instances, stop_event):
+        """Main loop flooding the LSAs of every running instance"""
         update_interval = 1 
         
-        while self.running:
-            lsa = self._create_lsa()
-            self.sequence_number += 1
-            self._flood_lsa(lsa)
-            time.sleep(update_interval)
+        while not stop_event.is_set() and any(ls.running for ls in ls_instances.values()):
+            for ls in list(ls_instances.values()):
+                if ls.running:
+                    ls._send_lsa()
+            stop_event.wait(update_interval)
 
     def get_route(self, destination):
         """Get the route and total delay to a destination"""
-        if destination not in self.shortest_paths:
+        version = self._route_version
+        shortest_paths = self.shortest_paths
+
+        cache_version, cache = self._route_cache
+        if cache_version != version:
+            cache = {}
+            self._route_cache = (version, cache)
+
+        route = cache.get(destination)
+        if route is not None:
+            return route
+
+        dest = self.name_to_id.get(destination)
+        if dest not in shortest_paths:
             return None, float('inf')
         
-        path_info = self.shortest_paths[destination]
-        return path_info['path'], path_info['cost']
+        path_info = shortest_paths[dest]
+        route = [self.id_to_name[node] for node in path_info['path']], path_info['cost']
+        cache[destination] = route
+        return route
 
     def print_routing_table(self):
         """Print the current routing table"""
-        print("\nRouting table for {}:".format(self.host.name))
-        print("Destination\tPath\t\tTotal Delay")
+        rows = ["\nRouting table for {}:".format(self.host.name), "Destination\tPath\t\tTotal Delay"]
         
-        if not self.shortest_paths:
-            print("No paths found. Current topology:")
-            for node, neighbors in self.topology.items():
-                print("{}: {}".format(node, neighbors))
-            return
+        shortest_paths = self.shortest_paths
+        if not shortest_paths:
+            rows.append("No paths found. Current topology:")
+            for node, neighbors in enumerate(self.topology):
+                rows.append("{}: {}".format(self.id_to_name[node],
+                                            {self.id_to_name[n]: cost for n, cost in neighbors.items()}))
         
-        for dest in sorted(self.shortest_paths.keys()):
-            path, delay = self.get_route(dest)
-            path_str = ' -> '.join(str(node) for node in path)
-            print("{}\t\t{}\t\t{:.1f}ms".format(dest, path_str, delay))
+        for dest in sorted(shortest_paths, key=self.id_to_name.__getitem__):
+            path_info = shortest_paths[dest]
+            path_str = ' -> '.join(self.id_to_name[node] for node in path_info['path'])
+            rows.append("{}\t\t{}\t\t{:.1f}ms".format(self.id_to_name[dest], path_str, path_info['cost']))
+
+        sys.stdout.write('\n'.join(rows) + '\n')
 
 
     @staticmethod
     def setup_link_state(ls_instances, net, link_delays):
         """Setup link state routing and store instances"""
         time.sleep(1)
+        adj, name_to_id, id_to_name = build_adjacency(link_delays)
+        all_pairs = LinkState._compute_all_pairs(adj, [name_to_id[host.name] for host in net.hosts], id_to_name)
         
         for host in net.hosts:
-            ls = LinkState(host, net, link_delays)
+            ls = LinkState(host, net, adj, name_to_id, id_to_name, all_pairs[name_to_id[host.name]])
             ls_instances[host.name] = ls
             ls.start()
             host.ls_instance = ls
+
+        instances_by_id = [None] * len(adj)
+        for host_name, ls in ls_instances.items():
+            instances_by_id[name_to_id[host_name]] = ls
+        for ls in ls_instances.values():
+            ls.instances_by_id = instances_by_id
+
+        LinkState._stop_event = threading.Event()
+        LinkState._scheduler_thread = threading.Thread(target=LinkState._run_scheduler, args=(ls_instances, LinkState._stop_event))
+        LinkState._scheduler_thread.start()
         
         time.sleep(2)
 
@@ -358,6 +583,10 @@ class LinkState:
         for ls in ls_instances.values():
             ls.stop()
 
+        if LinkState._stop_event is not None:
+            LinkState._stop_event.set()
+            LinkState._scheduler_thread.join()
+
     @staticmethod
     def print_all_routing_tables(ls_instances):
         """Print routing tables from all hosts"""
@@ -5,7 +5,8 @@ from topologies import LineTopo, RingTopo, StarTopo, MeshTopo, HybridTopo, creat
 from algorithms import DistanceVector
 from collections import defaultdict
 import threading
-from scapy.all import sniff, IP
+from concurrent.futures import ThreadPoolExecutor
+from scapy.all import AsyncSniffer
 
 class TestRoutingAlgorithm(unittest.TestCase):
     def setUp(self):
@@ -26,22 +27,18 @@ class TestRoutingAlgorithm(unittest.TestCase):
     def measure_convergence_time(self, topology_name):
         """Mede o tempo de convergência do algoritmo"""
         start_time = time.time()
-        stable = False
-        old_tables = {}
+        last_total = -1
+        stable_ticks = 0
 
-        while not stable and (time.time() - start_time) < 30:
-            stable = True
-            current_tables = {}
+        while stable_ticks < 4 and (time.time() - start_time) < 30:
+            total = sum(dv.version for dv in self.dv_instances.values())
 
-            for host_name, dv in self.dv_instances.items():
-                current_tables[host_name] = dict(dv.distance_vector)
+            if total == last_total:
+                stable_ticks += 1
+            else:
+                stable_ticks = 0
+                last_total = total
 
-                if host_name in old_tables:
-                    if old_tables[host_name] != current_tables[host_name]:
-                        stable = False
-                        break
-
-            old_tables = current_tables.copy()
             time.sleep(0.5)
 
         convergence_time = time.time() - start_time
@@ -50,26 +47,36 @@ class TestRoutingAlgorithm(unittest.TestCase):
 
     def measure_control_overhead(self, topology_name, duration=10):
         """Mede a sobrecarga de controle na rede"""
+        total = [0]
+
         def packet_callback(packet):
-            if packet.haslayer(IP):
-                self.control_overhead[topology_name] += len(packet)
+            total[0] += len(packet)
 
-        # Inicia captura de pacotes
-        sniff(prn=packet_callback, timeout=duration)
+        # Inicia captura de pacotes, o filtro BPF descarta pacotes não-IP no kernel
+        sniffer = AsyncSniffer(filter='ip', store=False, prn=packet_callback)
+        sniffer.start()
+        time.sleep(duration)
+        sniffer.stop()
 
+        self.control_overhead[topology_name] += total[0]
         return self.control_overhead[topology_name]
 
     def measure_packet_drops(self, topology_name):
         """Mede a quantidade de pacotes dropados"""
-        drops = 0
-
         hosts = self.net.hosts
-        for src in hosts:
+
+        # Cada host só pode executar um comando por vez, então paraleliza por origem
+        def ping_from(src):
+            drops = 0
             for dst in hosts:
                 if src != dst:
                     result = src.cmd('ping -c 1 -W 1 {}'.format(dst.IP()))
                     if '100% packet loss' in result:
                         drops += 1
+            return drops
+
+        with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+            drops = sum(executor.map(ping_from, hosts))
 
         self.packet_drops[topology_name] = drops
         return drops
@@ -1,12 +1,25 @@
 # topologies.py
 import random
-from collections import defaultdict
+import shutil
+import subprocess
 from mininet.node import OVSKernelSwitch
 from mininet.topo import Topo
 from mininet.net import Mininet
 from mininet.log import setLogLevel
 
-class LineTopo(Topo):
+HAS_TRACEROUTE = shutil.which('traceroute') is not None
+
+class DelayTopo(Topo):
+    """Topo that also records (node1, node2, delay) for every link it adds"""
+    def __init__(self, *args, **params):
+        self.link_meta = []
+        super().__init__(*args, **params)
+
+    def addLink(self, node1, node2, delay, **opts):
+        self.link_meta.append((node1, node2, float(delay)))
+        return super().addLink(node1, node2, delay='{}ms'.format(delay), **opts)
+
+class LineTopo(DelayTopo):
     def build(self):
         print("Creating line topology")
         hosts_count = 10
@@ -14,16 +27,16 @@ class LineTopo(Topo):
         switches = [self.addSwitch('s{}'.format(i)) for i in range(1, hosts_count)] 
 
         for i in range(hosts_count - 1):
-            self.addLink(hosts[i], switches[i], delay='{}ms'.format(random.randint(1, 10)))
+            self.addLink(hosts[i], switches[i], delay=random.randint(1, 10))
 
             if i < hosts_count - 2:
-                self.addLink(switches[i], switches[i + 1], delay='{}ms'.format(random.randint(1, 100)))
+                self.addLink(switches[i], switches[i + 1], delay=random.randint(1, 100))
 
-        self.addLink(switches[len(switches) - 1], hosts[len(hosts) - 1], delay='{}ms'.format(random.randint(1, 10)))
+        self.addLink(switches[len(switches) - 1], hosts[len(hosts) - 1], delay=random.randint(1, 10))
         print("Done creating line topology")
 
 
-class RingTopo(Topo):
+class RingTopo(DelayTopo):
     def build(self):
         print("Creating ring topology")
         hosts_count = 10
@@ -31,12 +44,12 @@ class RingTopo(Topo):
         switches = [self.addSwitch('s{}'.format(i), cls=OVSKernelSwitch) for i in range(1, hosts_count + 1)]
         
         for i in range(hosts_count):
-            self.addLink(hosts[i], switches[i], delay='{}ms'.format(random.randint(1, 10)))
-            self.addLink(switches[i], switches[(i + 1) % hosts_count], delay='{}ms'.format(random.randint(1, 100)))
+            self.addLink(hosts[i], switches[i], delay=random.randint(1, 10))
+            self.addLink(switches[i], switches[(i + 1) % hosts_count], delay=random.randint(1, 100))
 
         print("Done creating ring topology")
 
-class StarTopo(Topo):
+class StarTopo(DelayTopo):
     def build(self):
         print("Creating star topology")
         hosts_count = 10
@@ -44,11 +57,11 @@ class StarTopo(Topo):
         switch = self.addSwitch('s1')
 
         for i in range(hosts_count):
-            self.addLink(hosts[i], switch, delay='{}ms'.format(random.randint(1, 100)))
+            self.addLink(hosts[i], switch, delay=random.randint(1, 100))
 
         print("Done creating star topology")
 
-class MeshTopo(Topo):
+class MeshTopo(DelayTopo):
     def build(self):
         print("Creating mesh topology")
         hosts_count = 10
@@ -56,12 +69,11 @@ class MeshTopo(Topo):
 
         for i in range(hosts_count):
             for j in range(i + 1, hosts_count):
-                if j > i:
-                    self.addLink(hosts[i], hosts[j], delay='{}ms'.format(random.randint(1, 100)))
+                self.addLink(hosts[i], hosts[j], delay=random.randint(1, 100))
 
         print("Done creating full mesh topology")
 
-class HybridTopo(Topo):
+class HybridTopo(DelayTopo):
     def build(self):
         print("Creating hybrid topology")
         switch_count = 3
@@ -71,15 +83,17 @@ class HybridTopo(Topo):
         switches = [self.addSwitch('s{}'.format(i)) for i in range(1, switch_count + 1)] 
 
         for i in range(switch_count - 1):
-            self.addLink(switches[i], switches[i + 1], delay='{}ms'.format(random.randint(1, 100)))
+            self.addLink(switches[i], switches[i + 1], delay=random.randint(1, 100))
 
         for i in range(hosts_count):
             switch = i // hosts_per_switch
-            self.addLink(hosts[i], switches[switch], delay='{}ms'.format(random.randint(1, 10)))
+            self.addLink(hosts[i], switches[switch], delay=random.randint(1, 10))
 
         print("Done creating hybrid topology")
 
 def create_network(topology):
+    global HAS_TRACEROUTE
+
     net = Mininet(topo=topology)
     net.start()
 
@@ -91,23 +105,16 @@ def create_network(topology):
     print("Number of hosts:", len(net.hosts))
     print("Number of switches:", len(net.switches))
 
-    link_delays = defaultdict(str)
-
-    for link in net.links:
-        delay = link.intf1.params.get('delay', None)
-        if not delay:
-            delay = link.intf2.params.get('delay', None)
-        if delay:
-            link_delays[link] = delay
-        else:
-            link_delays[link] = 'No delay'
+    link_delays = topology.link_meta
 
-    for link, delay in link_delays.items():
-        print("Link {} - Delay: {}".format(link, delay))
+    for node1, node2, delay in link_delays:
+        print("Link {}<->{} - Delay: {}ms".format(node1, node2, delay))
 
-    for host in net.hosts:
-        print("Installing traceroute on {}".format(host.name))
-        host.cmd('apt-get install -y traceroute')
+    # Mininet hosts share the host filesystem, so installing once covers all of them
+    if not HAS_TRACEROUTE:
+        print("Installing traceroute")
+        subprocess.run(['apt-get', 'install', '-y', 'traceroute'], check=False)
+        HAS_TRACEROUTE = shutil.which('traceroute') is not None
 
     return net, link_delays
 